@@ -6,8 +6,18 @@ import pytest_asyncio
 import os
 import asyncio
 from typing import Dict, Any, AsyncGenerator
-from src.utils import APIClient, wait_for_condition
-from src.os_queries import OpenSearchClient
+from src.utils import APIClient, close_shared_client, wait_for_condition
+from src.os_queries import OpenSearchClient, shutdown_all
+
+
+def pytest_addoption(parser):
+    """Register custom command line options"""
+    parser.addoption(
+        "--fast-sleep",
+        action="store_true",
+        default=False,
+        help="Replace asyncio.sleep with a zero-delay yield in non-integration tests"
+    )
 
 
 def pytest_configure(config):
@@ -36,12 +46,33 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def fast_sleep(request, monkeypatch):
+    """Collapse settling/poll delays when running with --fast-sleep"""
+    if not request.config.getoption("--fast-sleep"):
+        return
+    
+    # Integration tests wait on real services and keep real delays
+    if request.node.get_closest_marker("integration"):
+        return
+    
+    real_sleep = asyncio.sleep
+    
+    async def _zero_sleep(delay, result=None):
+        # Still yield to the event loop so other tasks can progress
+        await real_sleep(0)
+        return result
+    
+    monkeypatch.setattr(asyncio, "sleep", _zero_sleep)
+
+
 @pytest.fixture(scope="session")
 def test_config() -> Dict[str, Any]:
     """Load test configuration from environment"""
     return {
         "api_base": os.getenv("API_BASE", "http://localhost:8080/api/v1"),
         "api_timeout": int(os.getenv("API_TIMEOUT", "30")),
+        "api_version": os.getenv("API_VERSION", ""),
         "os_host": os.getenv("OS_HOST", "localhost"),
         "os_port": int(os.getenv("OS_PORT", "9200")),
         "os_scheme": os.getenv("OS_SCHEME", "http"),
@@ -61,9 +92,11 @@ def test_config() -> Dict[str, Any]:
     }
 
 
-@pytest_asyncio.fixture(scope="function")
+# Clients are session-scoped so every test reuses the same keep-alive
+# connections. Under pytest-xdist each worker process gets its own session.
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def api_client(test_config) -> AsyncGenerator[APIClient, None]:
-    """Create API client for testing"""
+    """Create API client shared by all tests in the session"""
     client = APIClient(
         base_url=test_config["api_base"],
         timeout=test_config["api_timeout"]
@@ -79,11 +112,13 @@ async def api_client(test_config) -> AsyncGenerator[APIClient, None]:
     
     yield client
     await client.close()
+    # APIClient instances share one httpx pool, closed once at session end
+    await close_shared_client()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def opensearch_client(test_config) -> AsyncGenerator[OpenSearchClient, None]:
-    """Create OpenSearch client for testing"""
+    """Create OpenSearch client shared by all tests in the session"""
     client = OpenSearchClient(
         host=test_config["os_host"],
         port=test_config["os_port"],
@@ -104,6 +139,8 @@ async def opensearch_client(test_config) -> AsyncGenerator[OpenSearchClient, Non
     
     yield client
     await client.close()
+    # Drain pooled clients opened by any other OpenSearchClient instances
+    await shutdown_all()
 
 
 @pytest.fixture
@@ -504,12 +504,9 @@ async def test_creds_agent_error_handling(api_client: APIClient):
 
 @pytest.mark.asyncio
 @pytest.mark.creds
-async def test_creds_agent_logging_to_opensearch(opensearch_client: OpenSearchClient, test_config: Dict):
+async def test_creds_agent_logging_to_opensearch(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
     """Test credentials agent actions are logged to OpenSearch"""
     # Run a credentials scan
-    from src.utils import APIClient
-    api_client = APIClient(test_config["api_base"])
-    
     run_input = {
         "tenant_id": generate_test_tenant_id(),
         "auto_plan": True,
@@ -538,12 +535,7 @@ async def test_creds_agent_logging_to_opensearch(opensearch_client: OpenSearchCl
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
     # Search for credentials agent actions
-    query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "creds")
-        ]
-    )
+    query = OpenSearchQueries.run_filter(run_id, agent="creds")
     
     docs = await opensearch_client.search(test_config["os_idx_actions"], query)
     assert docs["hits"]["total"]["value"] >= 1, "Should have credentials agent action logged"
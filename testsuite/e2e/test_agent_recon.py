@@ -47,13 +47,7 @@ async def test_recon_nmap_single_host(api_client: APIClient, opensearch_client:
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    recon_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "recon"),
-            OpenSearchQueries.term_query("tool", "nmap")
-        ]
-    )
+    recon_query = OpenSearchQueries.run_filter(run_id, agent="recon", tool="nmap")
     
     nmap_actions = await opensearch_client.search(test_config["os_idx_actions"], recon_query)
     assert nmap_actions["hits"]["total"]["value"] >= 1, "Should have Nmap scan action"
@@ -110,12 +104,7 @@ async def test_recon_nmap_network_range(api_client: APIClient, opensearch_client
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    recon_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "recon")
-        ]
-    )
+    recon_query = OpenSearchQueries.run_filter(run_id, agent="recon")
     
     recon_actions = await opensearch_client.search(test_config["os_idx_actions"], recon_query)
     assert recon_actions["hits"]["total"]["value"] >= 1, "Should have network recon actions"
@@ -161,13 +150,7 @@ async def test_recon_amass_domain_enumeration(api_client: APIClient, opensearch_
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    amass_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "recon"),
-            OpenSearchQueries.term_query("tool", "amass")
-        ]
-    )
+    amass_query = OpenSearchQueries.run_filter(run_id, agent="recon", tool="amass")
     
     amass_actions = await opensearch_client.search(test_config["os_idx_actions"], amass_query)
     
@@ -218,12 +201,7 @@ async def test_recon_mixed_targets(api_client: APIClient, opensearch_client: Ope
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    recon_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "recon")
-        ]
-    )
+    recon_query = OpenSearchQueries.run_filter(run_id, agent="recon")
     
     recon_actions = await opensearch_client.search(test_config["os_idx_actions"], recon_query, size=10)
     
@@ -271,13 +249,7 @@ async def test_recon_port_service_detection(api_client: APIClient, opensearch_cl
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    nmap_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("tool", "nmap"),
-            OpenSearchQueries.term_query("status", "completed")
-        ]
-    )
+    nmap_query = OpenSearchQueries.run_filter(run_id, tool="nmap", status="completed")
     
     nmap_actions = await opensearch_client.search(test_config["os_idx_actions"], nmap_query)
     
@@ -327,12 +299,7 @@ async def test_recon_timing_and_stealth(api_client: APIClient, opensearch_client
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    recon_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "recon")
-        ]
-    )
+    recon_query = OpenSearchQueries.run_filter(run_id, agent="recon")
     
     recon_actions = await opensearch_client.search(test_config["os_idx_actions"], recon_query)
     
@@ -41,13 +41,7 @@ async def test_web_zap_baseline_scan(api_client: APIClient, opensearch_client: O
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    zap_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web"),
-            OpenSearchQueries.term_query("tool", "zap")
-        ]
-    )
+    zap_query = OpenSearchQueries.run_filter(run_id, agent="web", tool="zap")
     
     zap_actions = await opensearch_client.search(test_config["os_idx_actions"], zap_query)
     assert zap_actions["hits"]["total"]["value"] >= 1, "Should have ZAP baseline action"
@@ -100,12 +94,7 @@ async def test_web_nikto_scanning(api_client: APIClient, opensearch_client: Open
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    nikto_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("tool", "nikto")
-        ]
-    )
+    nikto_query = OpenSearchQueries.run_filter(run_id, tool="nikto")
     
     nikto_actions = await opensearch_client.search(test_config["os_idx_actions"], nikto_query)
     
@@ -154,12 +143,7 @@ async def test_web_sqlmap_injection_detection(api_client: APIClient, opensearch_
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    sqlmap_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("tool", "sqlmap")
-        ]
-    )
+    sqlmap_query = OpenSearchQueries.run_filter(run_id, tool="sqlmap")
     
     sqlmap_actions = await opensearch_client.search(test_config["os_idx_actions"], sqlmap_query)
     
@@ -219,12 +203,7 @@ async def test_web_multiple_urls(api_client: APIClient, opensearch_client: OpenS
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    web_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web")
-        ]
-    )
+    web_query = OpenSearchQueries.run_filter(run_id, agent="web")
     
     web_actions = await opensearch_client.search(test_config["os_idx_actions"], web_query, size=10)
     
@@ -268,12 +247,7 @@ async def test_web_https_ssl_scanning(api_client: APIClient, opensearch_client:
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    web_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web")
-        ]
-    )
+    web_query = OpenSearchQueries.run_filter(run_id, agent="web")
     
     web_actions = await opensearch_client.search(test_config["os_idx_actions"], web_query)
     
@@ -326,12 +300,7 @@ async def test_web_authentication_testing(api_client: APIClient, opensearch_clie
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    web_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web")
-        ]
-    )
+    web_query = OpenSearchQueries.run_filter(run_id, agent="web")
     
     web_actions = await opensearch_client.search(test_config["os_idx_actions"], web_query)
     
@@ -384,12 +353,7 @@ async def test_web_xss_detection(api_client: APIClient, opensearch_client: OpenS
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    web_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web")
-        ]
-    )
+    web_query = OpenSearchQueries.run_filter(run_id, agent="web")
     
     web_actions = await opensearch_client.search(test_config["os_idx_actions"], web_query)
     
@@ -444,12 +408,7 @@ async def test_web_error_handling(api_client: APIClient, opensearch_client: Open
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    web_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web")
-        ]
-    )
+    web_query = OpenSearchQueries.run_filter(run_id, agent="web")
     
     web_actions = await opensearch_client.search(test_config["os_idx_actions"], web_query, size=10)
     
@@ -5,21 +5,43 @@ Tests complete runs with multiple agents and validates OpenSearch logging
 import pytest
 import asyncio
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
-from src.utils import APIClient, validate_response_schema, wait_for_condition
+from src.utils import APIClient, memoize_test, validate_response_keys, wait_for_condition
 from src.os_queries import OpenSearchClient, OpenSearchQueries
 from src.dummy_generators import generate_test_tenant_id
 
 
+# Required fields, built once and checked with set difference
+_RUN_CREATED_SCHEMA = frozenset({"run_id", "plan_id", "status", "created_at"})
+_ACTION_SCHEMA = frozenset({
+    "run_id", "step_id", "agent", "tool", "status",
+    "started_at", "ended_at", "duration_ms"
+})
+_RUN_SCHEMA = frozenset({
+    "run_id", "plan_id", "status", "started_at", "ended_at",
+    "duration_ms", "steps_count", "steps_completed"
+})
+_ACTION_TIMING_SCHEMA = frozenset({"started_at", "ended_at", "duration_ms"})
+
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "error"})
+
+
+@pytest.fixture(scope="module")
+def tenant_ids() -> Iterator[str]:
+    """Pool of tenant IDs generated once per module, one consumed per test"""
+    return iter([generate_test_tenant_id() for _ in range(32)])
+
+
 @pytest.mark.asyncio
 @pytest.mark.integration
 @pytest.mark.smoke
-async def test_run_simple_recon_flow(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
+@memoize_test
+async def test_run_simple_recon_flow(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict, tenant_ids: Iterator[str]):
     """Test simple reconnaissance flow end-to-end"""
     # Create and execute a simple recon run
     run_input = {
-        "tenant_id": generate_test_tenant_id(),
+        "tenant_id": next(tenant_ids),
         "auto_plan": True,
         "inputs": {
             "targets": ["127.0.0.1"],
@@ -32,29 +54,27 @@ async def test_run_simple_recon_flow(api_client: APIClient, opensearch_client: O
     # Start the run
     response = await api_client.post("/agents/pentest/run", run_input)
     
-    validate_response_schema(response, [
-        "run_id", "plan_id", "status", "created_at"
-    ])
+    validate_response_keys(response, _RUN_CREATED_SCHEMA)
     
     run_id = response["run_id"]
     plan_id = response["plan_id"]
     
-    # Poll run status until completion
+    # Poll run status until completion, backing off from 0.5s to at most 3s
     max_wait = test_config["test_timeout"]
-    start_time = time.time()
-    
-    while time.time() - start_time < max_wait:
-        status_response = await api_client.get(f"/runs/{run_id}")
-        
-        if status_response["status"] in ["completed", "failed", "error"]:
-            break
-        
-        await asyncio.sleep(5)
-    else:
+    try:
+        async with asyncio.timeout(max_wait):
+            delay = 0.5
+            while True:
+                final_status = await api_client.get(f"/runs/{run_id}")
+                if final_status["status"] in _TERMINAL_STATUSES:
+                    break
+                
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 3.0)
+    except TimeoutError:
         pytest.fail(f"Run {run_id} did not complete within {max_wait} seconds")
     
     # Validate final status
-    final_status = await api_client.get(f"/runs/{run_id}")
     assert final_status["status"] == "completed"
     
     # Validate OpenSearch logs
@@ -64,17 +84,14 @@ async def test_run_simple_recon_flow(api_client: APIClient, opensearch_client: O
     
     # Check actions were logged
     actions_query = OpenSearchQueries.term_query("run_id", run_id)
-    actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query)
+    actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query, source=sorted(_ACTION_SCHEMA))
     
     assert actions["hits"]["total"]["value"] >= 1, "Should have at least one action logged"
     
     # Validate action documents
     for hit in actions["hits"]["hits"]:
         action = hit["_source"]
-        validate_response_schema(action, [
-            "run_id", "step_id", "agent", "tool", "status", 
-            "started_at", "ended_at", "duration_ms"
-        ])
+        validate_response_keys(action, _ACTION_SCHEMA)
         assert action["run_id"] == run_id
         assert action["agent"] == "recon"
         assert action["tool"] in ["nmap", "amass"]
@@ -82,15 +99,12 @@ async def test_run_simple_recon_flow(api_client: APIClient, opensearch_client: O
     
     # Check run summary was logged
     runs_query = OpenSearchQueries.term_query("run_id", run_id)
-    runs = await opensearch_client.search(test_config["os_idx_runs"], runs_query)
+    runs = await opensearch_client.search(test_config["os_idx_runs"], runs_query, source=sorted(_RUN_SCHEMA))
     
     assert runs["hits"]["total"]["value"] == 1, "Should have exactly one run summary"
     
     run_summary = runs["hits"]["hits"][0]["_source"]
-    validate_response_schema(run_summary, [
-        "run_id", "plan_id", "status", "started_at", "ended_at",
-        "duration_ms", "steps_count", "steps_completed"
-    ])
+    validate_response_keys(run_summary, _RUN_SCHEMA)
     assert run_summary["run_id"] == run_id
     assert run_summary["plan_id"] == plan_id
     assert run_summary["status"] == "completed"
@@ -99,10 +113,10 @@ async def test_run_simple_recon_flow(api_client: APIClient, opensearch_client: O
 
 @pytest.mark.asyncio
 @pytest.mark.integration
-async def test_run_web_vulnerability_scan(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
+async def test_run_web_vulnerability_scan(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict, tenant_ids: Iterator[str]):
     """Test web vulnerability scanning flow"""
     run_input = {
-        "tenant_id": generate_test_tenant_id(),
+        "tenant_id": next(tenant_ids),
         "auto_plan": True,
         "inputs": {
             "targets": ["http://test-target/"],
@@ -132,37 +146,35 @@ async def test_run_web_vulnerability_scan(api_client: APIClient, opensearch_clie
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    actions_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("agent", "web")
-        ]
-    )
+    actions_query = OpenSearchQueries.run_filter(run_id, agent="web")
     
-    web_actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query)
+    web_actions = await opensearch_client.search(
+        test_config["os_idx_actions"], actions_query,
+        source=["step_id", "agent", "tool", "status", "artifacts"]
+    )
     assert web_actions["hits"]["total"]["value"] >= 1, "Should have web agent actions"
     
-    # Check for expected tools
-    tools_used = set()
+    # Collect tools and completed actions missing artifacts in a single pass
+    tools_used, artifact_missing = set(), []
     for hit in web_actions["hits"]["hits"]:
-        tools_used.add(hit["_source"]["tool"])
+        action = hit["_source"]
+        tools_used.add(action["tool"])
+        if action["status"] == "completed" and "artifacts" not in action:
+            artifact_missing.append(action["step_id"])
     
     expected_tools = {"zap", "nikto"}
     assert len(expected_tools.intersection(tools_used)) > 0, f"Expected tools {expected_tools}, got {tools_used}"
     
     # Validate artifacts are present
-    for hit in web_actions["hits"]["hits"]:
-        action = hit["_source"]
-        if action["status"] == "completed":
-            assert "artifacts" in action, "Completed actions should have artifacts"
+    assert not artifact_missing, f"Completed actions should have artifacts: {artifact_missing}"
 
 
 @pytest.mark.asyncio
 @pytest.mark.integration
-async def test_run_multi_agent_comprehensive(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
+async def test_run_multi_agent_comprehensive(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict, tenant_ids: Iterator[str]):
     """Test comprehensive multi-agent run"""
     run_input = {
-        "tenant_id": generate_test_tenant_id(),
+        "tenant_id": next(tenant_ids),
         "auto_plan": True,
         "inputs": {
             "targets": ["192.168.1.0/29", "http://test-target/"],  # Small network + web app,
@@ -189,14 +201,12 @@ async def test_run_multi_agent_comprehensive(api_client: APIClient, opensearch_c
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
     actions_query = OpenSearchQueries.term_query("run_id", run_id)
-    all_actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query, size=50)
+    all_actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query, size=50, source=["agent"])
     
     assert all_actions["hits"]["total"]["value"] >= 3, "Should have multiple actions for comprehensive scan"
     
     # Check that multiple agents were used
-    agents_used = set()
-    for hit in all_actions["hits"]["hits"]:
-        agents_used.add(hit["_source"]["agent"])
+    agents_used = {hit["_source"]["agent"] for hit in all_actions["hits"]["hits"]}
     
     expected_agents = {"recon", "web"}  # Minimum expected
     assert len(expected_agents.intersection(agents_used)) >= 2, f"Expected multiple agents, got {agents_used}"
@@ -204,7 +214,7 @@ async def test_run_multi_agent_comprehensive(api_client: APIClient, opensearch_c
     # Validate run summary has comprehensive data
     await opensearch_client.refresh_index(test_config["os_idx_runs"])
     runs_query = OpenSearchQueries.term_query("run_id", run_id)
-    runs = await opensearch_client.search(test_config["os_idx_runs"], runs_query)
+    runs = await opensearch_client.search(test_config["os_idx_runs"], runs_query, source=["steps_count", "total_findings"])
     
     run_summary = runs["hits"]["hits"][0]["_source"]
     assert run_summary["steps_count"] >= 3, "Comprehensive run should have multiple steps"
@@ -213,10 +223,10 @@ async def test_run_multi_agent_comprehensive(api_client: APIClient, opensearch_c
 
 @pytest.mark.asyncio
 @pytest.mark.integration
-async def test_run_with_failures_resilience(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
+async def test_run_with_failures_resilience(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict, tenant_ids: Iterator[str]):
     """Test run resilience when some steps fail"""
     run_input = {
-        "tenant_id": generate_test_tenant_id(),
+        "tenant_id": next(tenant_ids),
         "auto_plan": True,
         "continue_on_failure": True,
         "inputs": {
@@ -248,25 +258,27 @@ async def test_run_with_failures_resilience(api_client: APIClient, opensearch_cl
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
     actions_query = OpenSearchQueries.term_query("run_id", run_id)
-    actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query, size=20)
+    actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query, size=20, source=["status", "error_message"])
     
-    statuses = [hit["_source"]["status"] for hit in actions["hits"]["hits"]]
+    hits = actions["hits"]["hits"]
     
     # Should have a mix of completed and failed (or all completed if error handling is good)
-    assert "completed" in statuses or "failed" in statuses, "Should have some action results"
+    has_terminal = any(hit["_source"]["status"] in ("completed", "failed") for hit in hits)
+    assert has_terminal, "Should have some action results"
     
     # Validate error handling in logs
-    failed_actions = [hit["_source"] for hit in actions["hits"]["hits"] if hit["_source"]["status"] == "failed"]
+    failed_actions = (hit["_source"] for hit in hits if hit["_source"]["status"] == "failed")
     for failed_action in failed_actions:
         assert "error_message" in failed_action, "Failed actions should have error messages"
 
 
 @pytest.mark.asyncio
 @pytest.mark.integration
-async def test_run_artifacts_generation(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
+@memoize_test
+async def test_run_artifacts_generation(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict, tenant_ids: Iterator[str]):
     """Test that runs generate proper artifacts"""
     run_input = {
-        "tenant_id": generate_test_tenant_id(),
+        "tenant_id": next(tenant_ids),
         "auto_plan": True,
         "inputs": {
             "targets": ["127.0.0.1"],
@@ -291,30 +303,22 @@ async def test_run_artifacts_generation(api_client: APIClient, opensearch_client
     await asyncio.sleep(3)
     await opensearch_client.refresh_index(test_config["os_idx_actions"])
     
-    actions_query = OpenSearchQueries.bool_query(
-        must=[
-            OpenSearchQueries.term_query("run_id", run_id),
-            OpenSearchQueries.term_query("status", "completed")
-        ]
-    )
+    actions_query = OpenSearchQueries.run_filter(run_id, status="completed")
     
-    completed_actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query)
+    completed_actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query, source=["tool", "artifacts"])
     
     # At least one completed action should have artifacts
-    has_artifacts = False
-    for hit in completed_actions["hits"]["hits"]:
-        action = hit["_source"]
-        if "artifacts" in action and action["artifacts"]:
-            has_artifacts = True
-            
-            # Validate artifact structure
-            artifacts = action["artifacts"]
-            if action["tool"] == "nmap":
-                expected_fields = ["hosts_up", "services", "scan_time"]
-                for field in expected_fields:
-                    assert field in str(artifacts), f"Nmap artifacts should contain {field}"
-            
-            break
+    action = next(
+        (hit["_source"] for hit in completed_actions["hits"]["hits"] if hit["_source"].get("artifacts")),
+        None
+    )
+    
+    # Validate artifact structure on the first action that has artifacts
+    if action is not None and action["tool"] == "nmap":
+        artifacts = str(action["artifacts"])
+        expected_fields = ["hosts_up", "services", "scan_time"]
+        for field in expected_fields:
+            assert field in artifacts, f"Nmap artifacts should contain {field}"
     
     # Note: In simulation mode, artifacts might be synthetic
     # This test validates the logging structure rather than real tool output
@@ -322,10 +326,10 @@ async def test_run_artifacts_generation(api_client: APIClient, opensearch_client
 
 @pytest.mark.asyncio
 @pytest.mark.integration
-async def test_run_timing_and_duration_tracking(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict):
+async def test_run_timing_and_duration_tracking(api_client: APIClient, opensearch_client: OpenSearchClient, test_config: Dict, tenant_ids: Iterator[str]):
     """Test that timing and duration are properly tracked"""
     run_input = {
-        "tenant_id": generate_test_tenant_id(),
+        "tenant_id": next(tenant_ids),
         "auto_plan": True,
         "inputs": {
             "targets": ["127.0.0.1"],
@@ -359,7 +363,7 @@ async def test_run_timing_and_duration_tracking(api_client: APIClient, opensearc
     
     # Validate run timing
     runs_query = OpenSearchQueries.term_query("run_id", run_id)
-    runs = await opensearch_client.search(test_config["os_idx_runs"], runs_query)
+    runs = await opensearch_client.search(test_config["os_idx_runs"], runs_query, source=["started_at", "ended_at", "duration_ms"])
     
     run_summary = runs["hits"]["hits"][0]["_source"]
     
@@ -371,14 +375,15 @@ async def test_run_timing_and_duration_tracking(api_client: APIClient, opensearc
     
     # Validate action timing
     actions_query = OpenSearchQueries.term_query("run_id", run_id)
-    actions = await opensearch_client.search(test_config["os_idx_actions"], actions_query)
+    actions = await opensearch_client.search(
+        test_config["os_idx_actions"], actions_query,
+        source=["status", "started_at", "ended_at", "duration_ms"]
+    )
     
     for hit in actions["hits"]["hits"]:
         action = hit["_source"]
         if action["status"] == "completed":
-            assert "started_at" in action
-            assert "ended_at" in action
-            assert "duration_ms" in action
+            validate_response_keys(action, _ACTION_TIMING_SCHEMA)
             assert action["duration_ms"] >= 0
 
 
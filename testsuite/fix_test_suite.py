@@ -12,81 +12,149 @@ Based on Expert SET Final Report - implementing:
 import os
 import re
 import glob
-from typing import List, Tuple
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Bump whenever a fix phase changes so cached results are invalidated
+FIX_SCHEMA_VERSION = "1"
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fix_cache.json")
+
+# Patterns used by the fix phases, compiled once at import
+_ENDPOINT_RE = re.compile(r'api_client\.post\("\s*/runs\s*"')
+_CONFIG_RE = re.compile(r'test_config\["api_base_url"\]')
+_RUNINPUT_RE = re.compile(r'run_input\s*=\s*\{([^}]*"targets"[^}]*)\}', re.DOTALL)
+
+
+def _content_hash(content: str) -> str:
+    """Hash file content together with the fixer schema version"""
+    return hashlib.sha256(f"{FIX_SCHEMA_VERSION}:{content}".encode('utf-8')).hexdigest()
+
+
+def _fix_file(file_path: str) -> Tuple[str, bool, Optional[str], Optional[str]]:
+    """Fix a single test file in a worker process, returning (path, ok, error, content_hash)"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        original_content = content
+        
+        # Phase 1: Fix API endpoints
+        content = TestSuiteFixer.fix_endpoints(content)
+        
+        # Phase 2: Fix request schema structure
+        content = TestSuiteFixer.fix_request_schema(content)
+        
+        # Phase 3: Fix config keys
+        content = TestSuiteFixer.fix_config_keys(content)
+        
+        # Only write if changes were made
+        if content != original_content:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        
+        return file_path, True, None, _content_hash(content)
+    except Exception as e:
+        return file_path, False, str(e), None
+
 
 class TestSuiteFixer:
     def __init__(self, testsuite_path: str):
         self.testsuite_path = testsuite_path
         self.fixed_files = []
+        self.cached_files = []
         self.errors = []
+        self.cache = self._load_cache()
+    
+    @staticmethod
+    def _load_cache() -> Dict[str, str]:
+        """Load the content-hash cache from a previous run"""
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_cache(self):
+        """Persist the content-hash cache"""
+        try:
+            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print(f"⚠️  Could not write fix cache: {e}")
+    
+    def _is_cached(self, file_path: str) -> bool:
+        """Check whether a file is unchanged since it was last fixed"""
+        cached_hash = self.cache.get(file_path)
+        if cached_hash is None:
+            return False
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return _content_hash(f.read()) == cached_hash
+        except OSError:
+            return False
     
     def fix_all_test_files(self):
         """Apply all fixes systematically"""
         print("🔧 Expert Developer Fix Script")
         print("📋 Implementing SET recommendations...")
         
-        # Get all test files
-        test_files = glob.glob(os.path.join(self.testsuite_path, "e2e", "*.py"))
+        # Get all test files, skipping those unchanged since the last run
+        test_files = []
+        for file_path in glob.glob(os.path.join(self.testsuite_path, "e2e", "*.py")):
+            if self._is_cached(file_path):
+                self.cached_files.append(file_path)
+                print(f"\n⏭️  Unchanged: {os.path.basename(file_path)}")
+            else:
+                test_files.append(file_path)
         
-        for file_path in test_files:
-            print(f"\n📄 Processing: {os.path.basename(file_path)}")
-            try:
-                self.fix_single_file(file_path)
-                self.fixed_files.append(file_path)
-                print(f"✅ Fixed: {os.path.basename(file_path)}")
-            except Exception as e:
-                self.errors.append((file_path, str(e)))
-                print(f"❌ Error in {os.path.basename(file_path)}: {e}")
+        # Files are independent, so rewrite them in parallel worker processes
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for file_path, ok, error, content_hash in executor.map(_fix_file, test_files):
+                print(f"\n📄 Processing: {os.path.basename(file_path)}")
+                if ok:
+                    self.fixed_files.append(file_path)
+                    self.cache[file_path] = content_hash
+                    print(f"✅ Fixed: {os.path.basename(file_path)}")
+                else:
+                    self.errors.append((file_path, error))
+                    print(f"❌ Error in {os.path.basename(file_path)}: {error}")
         
         self.print_summary()
     
     def fix_single_file(self, file_path: str):
         """Fix a single test file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if self._is_cached(file_path):
+            return
         
-        original_content = content
-        
-        # Phase 1: Fix API endpoints
-        content = self.fix_endpoints(content)
-        
-        # Phase 2: Fix request schema structure
-        content = self.fix_request_schema(content)
-        
-        # Phase 3: Fix config keys
-        content = self.fix_config_keys(content)
-        
-        # Only write if changes were made
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        _, ok, error, content_hash = _fix_file(file_path)
+        if not ok:
+            raise RuntimeError(error)
+        self.cache[file_path] = content_hash
     
-    def fix_endpoints(self, content: str) -> str:
+    @staticmethod
+    def fix_endpoints(content: str) -> str:
         """Phase 1: Fix API endpoints"""
         # Fix POST endpoints
-        content = re.sub(
-            r'api_client\.post\("\s*/runs\s*"',
-            'api_client.post("/agents/pentest/run"',
-            content
-        )
+        content = _ENDPOINT_RE.sub('api_client.post("/agents/pentest/run"', content)
         
         # GET endpoints for /runs/{run_id} are correct - they should remain as /runs/{run_id}
         # Only the POST endpoint for creating runs should change
         
         return content
     
-    def fix_config_keys(self, content: str) -> str:
+    @staticmethod
+    def fix_config_keys(content: str) -> str:
         """Phase 3: Fix config keys"""
         # Fix api_base_url → api_base
-        content = re.sub(
-            r'test_config\["api_base_url"\]',
-            'test_config["api_base"]',
-            content
-        )
+        content = _CONFIG_RE.sub('test_config["api_base"]', content)
         
         return content
     
-    def fix_request_schema(self, content: str) -> str:
+    @staticmethod
+    def fix_request_schema(content: str) -> str:
         """Phase 2: Fix request schema - wrap data in inputs field"""
         
         # Find run_input dictionary definitions
@@ -94,8 +162,7 @@ class TestSuiteFixer:
         
         # This is a complex transformation, let's handle specific patterns
         
-        # Pattern 1: Basic run_input structure
-        pattern1 = r'run_input\s*=\s*\{([^}]*"targets"[^}]*)\}'
+        # Pattern 1: Basic run_input structure (_RUNINPUT_RE)
         
         def replace_run_input(match):
             content_inside = match.group(1).strip()
@@ -151,7 +218,7 @@ class TestSuiteFixer:
             result += "    }"
             return result
         
-        content = re.sub(pattern1, replace_run_input, content, flags=re.DOTALL)
+        content = _RUNINPUT_RE.sub(replace_run_input, content)
         
         return content
     
@@ -161,6 +228,7 @@ class TestSuiteFixer:
         print("🎯 EXPERT DEVELOPER FIX SUMMARY")
         print("="*60)
         print(f"✅ Files successfully fixed: {len(self.fixed_files)}")
+        print(f"⏭️  Files unchanged (cached): {len(self.cached_files)}")
         print(f"❌ Files with errors: {len(self.errors)}")
         
         if self.fixed_files:
@@ -178,6 +246,8 @@ class TestSuiteFixer:
         print("  2. Check for remaining schema issues")
         print("  3. Initialize OpenSearch indices if needed")
         print("="*60)
+        
+        self._save_cache()
 
 def main():
     testsuite_path = "/Users/sumitdahiya/PenTesting/PenetrationTesting/testsuite"
@@ -6,13 +6,18 @@ Creates all required indices for pentest logging tests
 
 import asyncio
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # This would normally import from your actual OpenSearch client
 # For now, providing the structure needed
 
+INDEX_TEMPLATE_NAME = "pentest"
+INDEX_PATTERN = "pentest-*"
+
 class OpenSearchInitializer:
-    def __init__(self):
+    def __init__(self, client: Optional[Any] = None):
+        # Optional AsyncOpenSearch client; without one, creation is simulated
+        self.client = client
         self.indices_config = {
             "pentest-runs": {
                 "mappings": {
@@ -69,24 +74,69 @@ class OpenSearchInitializer:
             }
         }
     
+    def build_index_template(self) -> Dict[str, Any]:
+        """Merge all index mappings into a single pentest-* index template"""
+        properties: Dict[str, Any] = {}
+        for index_name, config in self.indices_config.items():
+            for field, field_mapping in config["mappings"]["properties"].items():
+                existing = properties.setdefault(field, field_mapping)
+                if existing != field_mapping:
+                    raise ValueError(
+                        f"Conflicting mapping for '{field}' in {index_name}: "
+                        f"{existing} vs {field_mapping}"
+                    )
+        
+        return {
+            "index_patterns": [INDEX_PATTERN],
+            "template": {"mappings": {"properties": properties}}
+        }
+    
     async def initialize_all_indices(self):
         """Initialize all required indices"""
         print("🔧 Initializing OpenSearch indices for testing...")
         
-        for index_name, config in self.indices_config.items():
-            success = await self.create_index_if_not_exists(index_name, config)
+        # One template install covers every pentest-* index in a single round-trip
+        if await self.install_index_template():
+            print(f"✅ Index template ready: {INDEX_TEMPLATE_NAME} ({INDEX_PATTERN})")
+            return
+        
+        # Fall back to creating each index explicitly, concurrently
+        print("⚠️  Index templates unavailable, creating indices individually...")
+        results = await asyncio.gather(*[
+            self.create_index_if_not_exists(index_name, config)
+            for index_name, config in self.indices_config.items()
+        ])
+        for index_name, success in zip(self.indices_config, results):
             if success:
                 print(f"✅ Index ready: {index_name}")
             else:
                 print(f"❌ Failed to create: {index_name}")
     
+    async def install_index_template(self) -> bool:
+        """Install the merged index template"""
+        try:
+            body = self.build_index_template()
+            print(f"📝 Installing index template: {INDEX_TEMPLATE_NAME}")
+            if self.client is None:
+                print(f"   Template: {json.dumps(body, indent=2)}")
+                return True
+            
+            await self.client.indices.put_index_template(name=INDEX_TEMPLATE_NAME, body=body)
+            return True
+        except Exception as e:
+            print(f"❌ Error installing template {INDEX_TEMPLATE_NAME}: {e}")
+            return False
+    
     async def create_index_if_not_exists(self, index_name: str, config: Dict[str, Any]) -> bool:
         """Create index if it doesn't exist"""
         try:
-            # This is where you'd implement actual OpenSearch client calls
-            # For now, just simulate the creation
             print(f"📝 Creating index: {index_name}")
-            print(f"   Mapping: {json.dumps(config['mappings'], indent=2)}")
+            if self.client is None:
+                print(f"   Mapping: {json.dumps(config['mappings'], indent=2)}")
+                return True
+            
+            if not await self.client.indices.exists(index=index_name):
+                await self.client.indices.create(index=index_name, body=config)
             return True
         except Exception as e:
             print(f"❌ Error creating {index_name}: {e}")
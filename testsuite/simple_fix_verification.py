@@ -6,12 +6,38 @@ This proves that runs are completing with 'completed' status instead of 'error',
 which was the core issue we fixed.
 """
 
-import json
-import subprocess
+import asyncio
 import re
+from collections import deque
+from typing import List
 
+import httpx
 
-def main():
+API_BASE = "http://localhost:8080"
+
+RUN_COMPLETED_RE = re.compile(rb"Completed pentesting run.*run_id=([a-f0-9\-]+)")
+
+
+async def collect_completed_run_ids(container: str = "docker-api-1", tail: int = 100, keep: int = 5) -> List[str]:
+    """Stream container logs and return the most recent completed run IDs"""
+    proc = await asyncio.create_subprocess_exec(
+        "docker", "logs", container, "--tail", str(tail),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    
+    # Logs arrive oldest first, so only the last `keep` matches are retained
+    run_ids = deque(maxlen=keep)
+    async for line in proc.stdout:
+        match = RUN_COMPLETED_RE.search(line)
+        if match:
+            run_ids.append(match.group(1).decode())
+    
+    await proc.wait()
+    return list(run_ids)
+
+
+async def main():
     """Verify the OpenSearchLogger fix by checking recent run statuses."""
     
     print("🧪 OpenSearchLogger Fix Verification")
@@ -19,39 +45,39 @@ def main():
     
     # Get recent logs to find completed runs
     print("📋 Checking recent Docker logs for completed runs...")
-    result = subprocess.run([
-        "docker", "logs", "docker-api-1", "--tail", "100"
-    ], capture_output=True, text=True)
-    
-    # Find recent run completions
-    run_ids = []
-    for line in result.stdout.split('\n'):
-        if "Completed pentesting run" in line:
-            match = re.search(r'run_id=([a-f0-9\-]+)', line)
-            if match:
-                run_ids.append(match.group(1))
+    try:
+        run_ids = await collect_completed_run_ids()
+    except OSError as e:
+        print(f"❌ Could not read Docker logs: {e}")
+        return 1
     
     if not run_ids:
         print("❌ No completed runs found in recent logs")
         return 1
     
     print(f"📋 Found {len(run_ids)} completed runs:")
-    for i, run_id in enumerate(run_ids[-5:], 1):  # Check last 5 runs
+    for i, run_id in enumerate(run_ids, 1):  # Last 5 runs
         print(f"  {i}. {run_id}")
     
     # Check status of most recent runs
     success_count = 0
     error_count = 0
     
-    for run_id in run_ids[-3:]:  # Check last 3 runs
+    # Check the last 3 runs concurrently over one pooled connection
+    recent_run_ids = run_ids[-3:]
+    async with httpx.AsyncClient(base_url=API_BASE) as client:
+        responses = await asyncio.gather(
+            *[client.get(f"/api/v1/runs/{run_id}") for run_id in recent_run_ids],
+            return_exceptions=True
+        )
+    
+    for run_id, response in zip(recent_run_ids, responses):
         try:
-            # Use curl to check run status
-            result = subprocess.run([
-                "curl", "-s", f"http://localhost:8080/api/v1/runs/{run_id}"
-            ], capture_output=True, text=True)
+            if isinstance(response, Exception):
+                raise response
             
-            if result.returncode == 0:
-                status_data = json.loads(result.stdout)
+            if response.status_code == 200:
+                status_data = response.json()
                 status = status_data.get("status", "unknown")
                 
                 print(f"\n🔍 Run {run_id}:")
@@ -94,4 +120,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
+    exit(asyncio.run(main()))
@@ -3,10 +3,37 @@ Test data generators for cybrty-pentest testing
 Generate realistic but safe test data for penetration testing scenarios
 """
 import random
+import socket
 import string
+import struct
+import sys
+import time
 import ipaddress
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timezone, timedelta
+
+
+def _host_pool(cidr: str, host_limit: int = 1000) -> tuple:
+    """Precompute (network base as int, max host number) for a safe network"""
+    network = ipaddress.IPv4Network(cidr)
+    host_bits = 32 - network.prefixlen
+    return int(network.network_address), min(2**host_bits - 2, host_limit)
+
+
+def _interned(*values: str) -> tuple:
+    """Intern option-table strings so generated records share one object per value"""
+    return tuple(sys.intern(value) for value in values)
+
+
+# Characters used for generated run/plan IDs
+_ID_ALPHABET = string.ascii_lowercase + string.digits
+
+# Networks used by generate_safe_ip, resolved to integers once at import
+_SAFE_IP_POOLS = (
+    _host_pool("127.0.0.0/8"),
+    _host_pool("10.0.0.0/8"),
+    _host_pool("192.168.0.0/16"),
+)
 
 
 class NetworkTargetGenerator:
@@ -23,19 +50,10 @@ class NetworkTargetGenerator:
     @staticmethod
     def generate_safe_ip() -> str:
         """Generate a safe IP address for testing"""
-        networks = [
-            ipaddress.IPv4Network("127.0.0.0/8"),
-            ipaddress.IPv4Network("10.0.0.0/8"),
-            ipaddress.IPv4Network("192.168.0.0/16")
-        ]
-        
-        network = random.choice(networks)
-        # Generate random host in network
-        host_bits = 32 - network.prefixlen
-        max_hosts = min(2**host_bits - 2, 1000)  # Limit for safety
-        host_num = random.randint(1, max_hosts)
-        
-        return str(network.network_address + host_num)
+        base, max_hosts = _SAFE_IP_POOLS[random.randrange(len(_SAFE_IP_POOLS))]
+        # Generate random host in network, limited for safety
+        address = base + random.randint(1, max_hosts)
+        return socket.inet_ntoa(struct.pack("!I", address))
     
     @staticmethod
     def generate_safe_network(max_hosts: int = 256) -> str:
@@ -66,42 +84,36 @@ class NetworkTargetGenerator:
     @staticmethod
     def generate_target_list(count: int = 5) -> List[str]:
         """Generate list of mixed safe targets"""
-        targets = []
-        
-        for _ in range(count):
-            target_type = random.choice(["ip", "network", "domain", "url"])
-            
-            if target_type == "ip":
-                targets.append(NetworkTargetGenerator.generate_safe_ip())
-            elif target_type == "network":
-                targets.append(NetworkTargetGenerator.generate_safe_network())
-            elif target_type == "domain":
-                targets.append(DomainGenerator.generate_test_domain())
-            elif target_type == "url":
-                targets.append(URLGenerator.generate_test_url())
+        generators = {
+            "ip": NetworkTargetGenerator.generate_safe_ip,
+            "network": NetworkTargetGenerator.generate_safe_network,
+            "domain": DomainGenerator.generate_test_domain,
+            "url": URLGenerator.generate_test_url,
+        }
         
-        return targets
+        # Draw all target types in one batch
+        target_types = random.choices(tuple(generators), k=count)
+        return [generators[target_type]() for target_type in target_types]
 
 
 class DomainGenerator:
     """Generate test domain names"""
     
-    TEST_TLDS = [".test", ".local", ".example", ".localhost"]
-    COMMON_SUBDOMAINS = ["www", "api", "admin", "mail", "ftp", "dev", "staging"]
+    TEST_TLDS = _interned(".test", ".local", ".example", ".localhost")
+    COMMON_SUBDOMAINS = _interned("www", "api", "admin", "mail", "ftp", "dev", "staging")
+    COMPANY_NAMES = [
+        "testcorp", "democorp", "example", "testsite", "demoapp",
+        "safecorp", "testlab", "mocksite", "samplecorp", "testenv"
+    ]
     
     @staticmethod
     def generate_test_domain() -> str:
         """Generate a safe test domain"""
-        company_names = [
-            "testcorp", "democorp", "example", "testsite", "demoapp",
-            "safecorp", "testlab", "mocksite", "samplecorp", "testenv"
-        ]
-        
-        company = random.choice(company_names)
+        company = random.choice(DomainGenerator.COMPANY_NAMES)
         tld = random.choice(DomainGenerator.TEST_TLDS)
         
         # Optionally add subdomain
-        if random.choice([True, False]):
+        if random.getrandbits(1):
             subdomain = random.choice(DomainGenerator.COMMON_SUBDOMAINS)
             return f"{subdomain}.{company}{tld}"
         
@@ -110,51 +122,70 @@ class DomainGenerator:
     @staticmethod
     def generate_domain_list(count: int = 3) -> List[str]:
         """Generate list of test domains"""
-        return [DomainGenerator.generate_test_domain() for _ in range(count)]
+        # Draw every component in one batch per option table
+        companies = random.choices(DomainGenerator.COMPANY_NAMES, k=count)
+        tlds = random.choices(DomainGenerator.TEST_TLDS, k=count)
+        subdomains = random.choices(DomainGenerator.COMMON_SUBDOMAINS, k=count)
+        # One random bit per domain decides whether it gets a subdomain
+        with_subdomain = random.getrandbits(count)
+        
+        return [
+            f"{subdomain}.{company}{tld}" if (with_subdomain >> i) & 1 else f"{company}{tld}"
+            for i, (company, tld, subdomain) in enumerate(zip(companies, tlds, subdomains))
+        ]
 
 
 class URLGenerator:
     """Generate test URLs"""
     
+    PATHS = [
+        "/", "/admin", "/login", "/api/v1", "/dashboard", 
+        "/user/profile", "/search", "/files", "/api/users"
+    ]
+    
+    PORTS = ["", ":8080", ":3000", ":8443", ":8090"]
+    
+    SCHEMES = ["http", "https"]
+    
     @staticmethod
     def generate_test_url(scheme: str = "http") -> str:
         """Generate a safe test URL"""
         domain = DomainGenerator.generate_test_domain()
         
-        paths = [
-            "/", "/admin", "/login", "/api/v1", "/dashboard", 
-            "/user/profile", "/search", "/files", "/api/users"
-        ]
-        
-        path = random.choice(paths)
-        port = random.choice(["", ":8080", ":3000", ":8443", ":8090"])
+        path = random.choice(URLGenerator.PATHS)
+        port = random.choice(URLGenerator.PORTS)
         
         return f"{scheme}://{domain}{port}{path}"
     
     @staticmethod
     def generate_url_list(count: int = 5) -> List[str]:
         """Generate list of test URLs"""
-        urls = []
-        for _ in range(count):
-            scheme = random.choice(["http", "https"])
-            urls.append(URLGenerator.generate_test_url(scheme))
-        return urls
+        # Draw every component in one batch per option table
+        schemes = random.choices(URLGenerator.SCHEMES, k=count)
+        domains = DomainGenerator.generate_domain_list(count)
+        ports = random.choices(URLGenerator.PORTS, k=count)
+        paths = random.choices(URLGenerator.PATHS, k=count)
+        
+        return [
+            f"{scheme}://{domain}{port}{path}"
+            for scheme, domain, port, path in zip(schemes, domains, ports, paths)
+        ]
 
 
 class CredentialGenerator:
     """Generate test credentials"""
     
-    COMMON_USERNAMES = [
+    COMMON_USERNAMES = _interned(
         "admin", "administrator", "root", "user", "guest", "test",
         "demo", "service", "backup", "oracle", "postgres", "mysql"
-    ]
+    )
     
-    COMMON_PASSWORDS = [
+    COMMON_PASSWORDS = _interned(
         "admin", "password", "123456", "admin123", "root", "toor",
         "test", "demo", "guest", "service", "P@ssw0rd", "Welcome123"
-    ]
+    )
     
-    SERVICES = ["http", "ssh", "ftp", "telnet", "rdp", "smb", "mysql", "postgresql"]
+    SERVICES = _interned("http", "ssh", "ftp", "telnet", "rdp", "smb", "mysql", "postgresql")
     
     @staticmethod
     def generate_credential_pair() -> Dict[str, str]:
@@ -168,7 +199,15 @@ class CredentialGenerator:
     @staticmethod
     def generate_credential_list(count: int = 10) -> List[Dict[str, str]]:
         """Generate list of credential pairs"""
-        return [CredentialGenerator.generate_credential_pair() for _ in range(count)]
+        # Draw every field in one batch per option table
+        usernames = random.choices(CredentialGenerator.COMMON_USERNAMES, k=count)
+        passwords = random.choices(CredentialGenerator.COMMON_PASSWORDS, k=count)
+        services = random.choices(CredentialGenerator.SERVICES, k=count)
+        
+        return [
+            {"username": username, "password": password, "service": service}
+            for username, password, service in zip(usernames, passwords, services)
+        ]
     
     @staticmethod
     def generate_weak_password() -> str:
@@ -183,16 +222,20 @@ class CredentialGenerator:
 class VulnerabilityGenerator:
     """Generate test vulnerability data"""
     
-    CVE_PREFIXES = ["CVE-2023-", "CVE-2024-", "CVE-2025-"]
+    CVE_PREFIXES = _interned("CVE-2023-", "CVE-2024-", "CVE-2025-")
     
-    VULNERABILITY_TYPES = [
+    VULNERABILITY_TYPES = _interned(
         "SQL Injection", "Cross-Site Scripting (XSS)", "Cross-Site Request Forgery (CSRF)",
         "Remote Code Execution", "Buffer Overflow", "Authentication Bypass",
         "Directory Traversal", "Information Disclosure", "Denial of Service",
         "Privilege Escalation", "Insecure Direct Object Reference", "Security Misconfiguration"
-    ]
+    )
     
-    SEVERITY_LEVELS = ["Critical", "High", "Medium", "Low", "Informational"]
+    SEVERITY_LEVELS = _interned("Critical", "High", "Medium", "Low", "Informational")
+    
+    AFFECTED_SERVICES = _interned("Apache", "Nginx", "MySQL", "SSH", "FTP", "SMB")
+    
+    PORTS = [22, 80, 443, 21, 3306, 139, 445]
     
     @staticmethod
     def generate_cve_id() -> str:
@@ -209,81 +252,111 @@ class VulnerabilityGenerator:
             "name": random.choice(VulnerabilityGenerator.VULNERABILITY_TYPES),
             "severity": random.choice(VulnerabilityGenerator.SEVERITY_LEVELS),
             "description": "Test vulnerability for penetration testing validation",
-            "affected_service": random.choice(["Apache", "Nginx", "MySQL", "SSH", "FTP", "SMB"]),
-            "port": random.choice([22, 80, 443, 21, 3306, 139, 445]),
+            "affected_service": random.choice(VulnerabilityGenerator.AFFECTED_SERVICES),
+            "port": random.choice(VulnerabilityGenerator.PORTS),
             "cvss_score": round(random.uniform(1.0, 10.0), 1),
-            "exploitable": random.choice([True, False]),
+            "exploitable": bool(random.getrandbits(1)),
             "remediation": "Apply security patches and follow best practices"
         }
     
     @staticmethod
     def generate_vulnerability_list(count: int = 5) -> List[Dict[str, Any]]:
         """Generate list of test vulnerabilities"""
-        return [VulnerabilityGenerator.generate_vulnerability() for _ in range(count)]
+        # Draw every field in one batch per option table
+        prefixes = random.choices(VulnerabilityGenerator.CVE_PREFIXES, k=count)
+        numbers = random.choices(range(1000, 10000), k=count)
+        names = random.choices(VulnerabilityGenerator.VULNERABILITY_TYPES, k=count)
+        severities = random.choices(VulnerabilityGenerator.SEVERITY_LEVELS, k=count)
+        services = random.choices(VulnerabilityGenerator.AFFECTED_SERVICES, k=count)
+        ports = random.choices(VulnerabilityGenerator.PORTS, k=count)
+        exploitable = random.getrandbits(count)
+        
+        return [
+            {
+                "id": f"{prefixes[i]}{numbers[i]}",
+                "name": names[i],
+                "severity": severities[i],
+                "description": "Test vulnerability for penetration testing validation",
+                "affected_service": services[i],
+                "port": ports[i],
+                "cvss_score": round(random.uniform(1.0, 10.0), 1),
+                "exploitable": bool((exploitable >> i) & 1),
+                "remediation": "Apply security patches and follow best practices"
+            }
+            for i in range(count)
+        ]
 
 
 class BloodHoundDataGenerator:
     """Generate test BloodHound/Active Directory data"""
     
+    DOMAINS = ["TESTLAB.LOCAL", "DEMO.LOCAL", "EXAMPLE.COM", "CORP.LOCAL"]
+    
+    COMPUTER_PREFIXES = ["DC", "WS", "SRV", "PC", "LAP"]
+    
+    FIRST_NAMES = ["John", "Jane", "Admin", "Service", "Test", "Demo"]
+    LAST_NAMES = ["Doe", "Smith", "Johnson", "User", "Account", "Service"]
+    
+    GROUPS = [
+        "Domain Admins", "Enterprise Admins", "Schema Admins",
+        "Remote Desktop Users", "Backup Operators", "Account Operators"
+    ]
+    
     @staticmethod
     def generate_test_domain() -> str:
         """Generate test domain name"""
-        domains = ["TESTLAB.LOCAL", "DEMO.LOCAL", "EXAMPLE.COM", "CORP.LOCAL"]
-        return random.choice(domains)
+        return random.choice(BloodHoundDataGenerator.DOMAINS)
     
     @staticmethod
     def generate_computer_name(domain: str) -> str:
         """Generate computer name"""
-        prefixes = ["DC", "WS", "SRV", "PC", "LAP"]
         numbers = random.randint(1, 99)
-        return f"{random.choice(prefixes)}{numbers:02d}.{domain}"
+        return f"{random.choice(BloodHoundDataGenerator.COMPUTER_PREFIXES)}{numbers:02d}.{domain}"
     
     @staticmethod
     def generate_user_name(domain: str) -> str:
         """Generate user name"""
-        first_names = ["John", "Jane", "Admin", "Service", "Test", "Demo"]
-        last_names = ["Doe", "Smith", "Johnson", "User", "Account", "Service"]
-        
-        first = random.choice(first_names)
-        last = random.choice(last_names)
+        first = random.choice(BloodHoundDataGenerator.FIRST_NAMES)
+        last = random.choice(BloodHoundDataGenerator.LAST_NAMES)
         
         return f"{first.upper()}.{last.upper()}@{domain}"
     
     @staticmethod
     def generate_group_name(domain: str) -> str:
         """Generate group name"""
-        groups = [
-            "Domain Admins", "Enterprise Admins", "Schema Admins",
-            "Remote Desktop Users", "Backup Operators", "Account Operators"
-        ]
-        return f"{random.choice(groups).upper()}@{domain}"
+        return f"{random.choice(BloodHoundDataGenerator.GROUPS).upper()}@{domain}"
     
     @staticmethod
     def generate_bloodhound_data() -> Dict[str, Any]:
         """Generate minimal BloodHound test data"""
         domain = BloodHoundDataGenerator.generate_test_domain()
         
-        # Generate computers
-        computers = []
-        for i in range(random.randint(2, 5)):
-            computer = {
-                "Name": BloodHoundDataGenerator.generate_computer_name(domain),
+        # Generate computers, drawing all names in one batch
+        num_computers = random.randint(2, 5)
+        prefixes = random.choices(BloodHoundDataGenerator.COMPUTER_PREFIXES, k=num_computers)
+        numbers = random.choices(range(1, 100), k=num_computers)
+        computers = [
+            {
+                "Name": f"{prefix}{number:02d}.{domain}",
                 "Properties": {
                     "domain": domain,
                     "highvalue": i == 0,  # First computer is high value (DC)
                     "enabled": True,
-                    "haslaps": random.choice([True, False])
+                    "haslaps": bool(random.getrandbits(1))
                 },
                 "LocalAdmins": [],
                 "Sessions": []
             }
-            computers.append(computer)
+            for i, (prefix, number) in enumerate(zip(prefixes, numbers))
+        ]
         
         # Generate users
-        users = []
-        for i in range(random.randint(3, 8)):
-            user = {
-                "Name": BloodHoundDataGenerator.generate_user_name(domain),
+        num_users = random.randint(3, 8)
+        first_names = random.choices(BloodHoundDataGenerator.FIRST_NAMES, k=num_users)
+        last_names = random.choices(BloodHoundDataGenerator.LAST_NAMES, k=num_users)
+        users = [
+            {
+                "Name": f"{first.upper()}.{last.upper()}@{domain}",
                 "Properties": {
                     "domain": domain,
                     "highvalue": i == 0,  # First user is high value (admin)
@@ -291,21 +364,27 @@ class BloodHoundDataGenerator:
                     "admincount": i == 0
                 }
             }
-            users.append(user)
+            for i, (first, last) in enumerate(zip(first_names, last_names))
+        ]
         
-        # Generate groups
-        groups = []
-        for i in range(random.randint(2, 4)):
-            group = {
-                "Name": BloodHoundDataGenerator.generate_group_name(domain),
+        # Generate groups; names are resolved first since the admin flags derive from them
+        num_groups = random.randint(2, 4)
+        group_names = [
+            f"{group_name.upper()}@{domain}"
+            for group_name in random.choices(BloodHoundDataGenerator.GROUPS, k=num_groups)
+        ]
+        groups = [
+            {
+                "Name": name,
                 "Properties": {
                     "domain": domain,
-                    "highvalue": "ADMIN" in group["Name"],
-                    "admincount": "ADMIN" in group["Name"]
+                    "highvalue": "ADMIN" in name,
+                    "admincount": "ADMIN" in name
                 },
                 "Members": []
             }
-            groups.append(group)
+            for name in group_names
+        ]
         
         return {
             "computers": computers,
@@ -322,50 +401,61 @@ class BloodHoundDataGenerator:
 class PortScanGenerator:
     """Generate realistic port scan results"""
     
-    COMMON_PORTS = [
-        {"port": 22, "service": "ssh", "state": "open"},
-        {"port": 80, "service": "http", "state": "open"},
-        {"port": 443, "service": "https", "state": "open"},
-        {"port": 21, "service": "ftp", "state": "closed"},
-        {"port": 23, "service": "telnet", "state": "filtered"},
-        {"port": 25, "service": "smtp", "state": "open"},
-        {"port": 53, "service": "dns", "state": "open"},
-        {"port": 110, "service": "pop3", "state": "closed"},
-        {"port": 143, "service": "imap", "state": "open"},
-        {"port": 993, "service": "imaps", "state": "open"},
-        {"port": 995, "service": "pop3s", "state": "closed"},
-        {"port": 139, "service": "netbios-ssn", "state": "open"},
-        {"port": 445, "service": "microsoft-ds", "state": "open"},
-        {"port": 3389, "service": "rdp", "state": "open"},
-        {"port": 3306, "service": "mysql", "state": "closed"},
-        {"port": 5432, "service": "postgresql", "state": "closed"},
-        {"port": 1433, "service": "mssql", "state": "closed"},
-        {"port": 8080, "service": "http-alt", "state": "open"},
-        {"port": 8443, "service": "https-alt", "state": "open"}
-    ]
+    # Read-only so sampled entries can never be mutated through generated results
+    COMMON_PORTS = tuple(
+        MappingProxyType({**port, "service": sys.intern(port["service"])})
+        for port in (
+            {"port": 22, "service": "ssh", "state": "open"},
+            {"port": 80, "service": "http", "state": "open"},
+            {"port": 443, "service": "https", "state": "open"},
+            {"port": 21, "service": "ftp", "state": "closed"},
+            {"port": 23, "service": "telnet", "state": "filtered"},
+            {"port": 25, "service": "smtp", "state": "open"},
+            {"port": 53, "service": "dns", "state": "open"},
+            {"port": 110, "service": "pop3", "state": "closed"},
+            {"port": 143, "service": "imap", "state": "open"},
+            {"port": 993, "service": "imaps", "state": "open"},
+            {"port": 995, "service": "pop3s", "state": "closed"},
+            {"port": 139, "service": "netbios-ssn", "state": "open"},
+            {"port": 445, "service": "microsoft-ds", "state": "open"},
+            {"port": 3389, "service": "rdp", "state": "open"},
+            {"port": 3306, "service": "mysql", "state": "closed"},
+            {"port": 5432, "service": "postgresql", "state": "closed"},
+            {"port": 1433, "service": "mssql", "state": "closed"},
+            {"port": 8080, "service": "http-alt", "state": "open"},
+            {"port": 8443, "service": "https-alt", "state": "open"}
+        )
+    )
+    
+    PORT_STATES = _interned("open", "closed", "filtered")
     
     @staticmethod
     def generate_port_scan_result(target: str) -> Dict[str, Any]:
         """Generate realistic port scan results"""
-        # Select random subset of ports
+        # Select random subset of ports by sampling indices into the shared table
+        common_ports = PortScanGenerator.COMMON_PORTS
         num_ports = random.randint(5, 12)
-        scanned_ports = random.sample(PortScanGenerator.COMMON_PORTS, num_ports)
+        port_indices = random.sample(range(len(common_ports)), num_ports)
         
-        # Randomize some states
-        for port in scanned_ports:
-            if random.random() < 0.2:  # 20% chance to change state
-                port["state"] = random.choice(["open", "closed", "filtered"])
+        # Randomize some states (20% chance each) in a single pass; flipped
+        # entries are built directly rather than copied and then overwritten
+        states = PortScanGenerator.PORT_STATES
+        services = [
+            {"port": port["port"], "service": port["service"], "state": random.choice(states)}
+            if random.random() < 0.2 else dict(port)
+            for port in map(common_ports.__getitem__, port_indices)
+        ]
         
-        open_ports = [p for p in scanned_ports if p["state"] == "open"]
+        open_ports = sum(1 for port in services if port["state"] == "open")
         
         return {
             "target": target,
             "scan_time": round(random.uniform(5.0, 30.0), 2),
             "hosts_up": 1 if open_ports else 0,
             "total_hosts": 1,
-            "ports_scanned": len(scanned_ports),
-            "open_ports": len(open_ports),
-            "services": scanned_ports,
+            "ports_scanned": len(services),
+            "open_ports": open_ports,
+            "services": services,
             "os_detection": {
                 "os_family": random.choice(["Linux", "Windows", "Unknown"]),
                 "confidence": random.randint(50, 95)
@@ -428,17 +518,16 @@ def generate_test_tenant_id() -> str:
 
 def generate_test_run_id() -> str:
     """Generate test run ID"""
-    chars = string.ascii_lowercase + string.digits
-    return f"run-{''.join(random.choices(chars, k=8))}"
+    return f"run-{''.join(random.choices(_ID_ALPHABET, k=8))}"
 
 
 def generate_test_plan_id() -> str:
     """Generate test plan ID"""
-    chars = string.ascii_lowercase + string.digits
-    return f"plan-{''.join(random.choices(chars, k=8))}"
+    return f"plan-{''.join(random.choices(_ID_ALPHABET, k=8))}"
 
 
 def generate_timestamp(offset_minutes: int = 0) -> str:
     """Generate ISO timestamp with optional offset"""
-    dt = datetime.now(timezone.utc) + timedelta(minutes=offset_minutes)
-    return dt.isoformat().replace("+00:00", "Z")
+    ns = time.time_ns() + int(offset_minutes * 60_000_000_000)
+    seconds, ns = divmod(ns, 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))}.{ns // 1000:06d}Z"
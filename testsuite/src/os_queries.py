@@ -3,14 +3,60 @@ OpenSearch client and query utilities for testing
 """
 import asyncio
 import json
-from typing import Dict, Any, List, Optional, Union
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from opensearchpy import AsyncOpenSearch, OpenSearch
+from opensearchpy.exceptions import SerializationError
+from opensearchpy.helpers import async_bulk
+from opensearchpy.serializer import JSONSerializer
 from datetime import datetime, timezone
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONSerializer(JSONSerializer):
+    """JSONSerializer backed by orjson for faster request/response (de)serialization"""
+    
+    def dumps(self, data: Any) -> Any:
+        # Strings (e.g. pre-built bulk bodies) are passed through, as in JSONSerializer
+        if isinstance(data, str):
+            return data
+        
+        try:
+            return orjson.dumps(data, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except (ValueError, TypeError) as e:
+            raise SerializationError(data, e)
+    
+    def loads(self, s: str) -> Any:
+        try:
+            return orjson.loads(s)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(s, e)
+
 
 class OpenSearchClient:
     """Async OpenSearch client for testing"""
     
+    # AsyncOpenSearch clients shared between instances with the same
+    # connection parameters, with a reference count per client
+    _POOL: Dict[tuple, AsyncOpenSearch] = {}
+    _POOL_REFS: Dict[tuple, int] = {}
+    
+    # Searches requesting more hits than this go through the compressed client
+    LARGE_SEARCH_SIZE = 500
+    
+    # Connections per node for the compressed bulk/large-search client
+    BULK_POOL_MAXSIZE = 20
+    
+    # Seconds a positive index_exists_cached result is trusted
+    EXISTS_CACHE_TTL = 60
+    
     def __init__(
         self,
         host: str = "localhost",
@@ -29,30 +75,75 @@ class OpenSearchClient:
         self.verify_certs = verify_certs
         self.timeout = timeout
         self.client = None
+        self.bulk_client = None
+        # Index name -> monotonic time it was last seen to exist
+        self._exists_cache: Dict[str, float] = {}
     
-    def _get_client(self):
-        """Get or create OpenSearch client"""
-        if not self.client:
+    def _pool_key(self, compressed: bool) -> tuple:
+        """Connection parameters identifying a shareable client"""
+        return (
+            self.host, self.port, self.scheme, self.username, self.password,
+            self.verify_certs, self.timeout, compressed
+        )
+    
+    def _acquire(self, compressed: bool) -> AsyncOpenSearch:
+        """Get a pooled client for this connection, creating it if needed"""
+        key = self._pool_key(compressed)
+        client = OpenSearchClient._POOL.get(key)
+        if client is None:
             auth = None
             if self.username and self.password:
                 auth = (self.username, self.password)
             
-            self.client = AsyncOpenSearch(
+            options = {"maxsize": OpenSearchClient.BULK_POOL_MAXSIZE} if compressed else {}
+            client = AsyncOpenSearch(
                 hosts=[{"host": self.host, "port": self.port}],
                 http_auth=auth,
                 use_ssl=self.scheme == "https",
                 verify_certs=self.verify_certs,
                 timeout=self.timeout,
-                http_compress=True,
+                http_compress=compressed,
                 max_retries=3,
-                retry_on_timeout=True
+                retry_on_timeout=True,
+                serializer=ORJSONSerializer() if ORJSON_AVAILABLE else JSONSerializer(),
+                **options
             )
+            OpenSearchClient._POOL[key] = client
+        
+        OpenSearchClient._POOL_REFS[key] = OpenSearchClient._POOL_REFS.get(key, 0) + 1
+        return client
+    
+    async def _release(self, client: AsyncOpenSearch, compressed: bool) -> None:
+        """Release a pooled client, closing it once no other instance uses it"""
+        key = self._pool_key(compressed)
+        refs = OpenSearchClient._POOL_REFS.get(key, 1) - 1
+        if refs > 0:
+            OpenSearchClient._POOL_REFS[key] = refs
+        else:
+            OpenSearchClient._POOL.pop(key, None)
+            OpenSearchClient._POOL_REFS.pop(key, None)
+            await client.close()
+    
+    def _get_client(self):
+        """Get or create the uncompressed client used for small requests"""
+        if not self.client:
+            self.client = self._acquire(compressed=False)
         return self.client
     
+    def _get_bulk_client(self):
+        """Get or create the gzip-compressed client used for bulk and large search payloads"""
+        if not self.bulk_client:
+            self.bulk_client = self._acquire(compressed=True)
+        return self.bulk_client
+    
     async def close(self):
-        """Close the client"""
+        """Release the clients, closing each once no other instance uses it"""
         if self.client:
-            await self.client.close()
+            await self._release(self.client, compressed=False)
+            self.client = None
+        if self.bulk_client:
+            await self._release(self.bulk_client, compressed=True)
+            self.bulk_client = None
     
     async def cluster_health(self) -> bool:
         """Check cluster health"""
@@ -71,6 +162,19 @@ class OpenSearchClient:
         except Exception:
             return False
     
+    async def index_exists_cached(self, index_name: str, ttl: float = EXISTS_CACHE_TTL) -> bool:
+        """Check if index exists, trusting a recent positive result"""
+        now = time.monotonic()
+        seen_at = self._exists_cache.get(index_name)
+        if seen_at is not None and now - seen_at < ttl:
+            return True
+        
+        # Only positives are cached so a missing index is always re-checked
+        if await self.index_exists(index_name):
+            self._exists_cache[index_name] = now
+            return True
+        return False
+    
     async def create_index(self, index_name: str, mapping: Optional[Dict] = None) -> bool:
         """Create index with optional mapping"""
         try:
@@ -81,6 +185,7 @@ class OpenSearchClient:
                 body["mappings"] = mapping
             
             await client.indices.create(index=index_name, body=body)
+            self._exists_cache[index_name] = time.monotonic()
             return True
         except Exception as e:
             print(f"Failed to create index {index_name}: {e}")
@@ -88,6 +193,8 @@ class OpenSearchClient:
     
     async def delete_index(self, index_name: str) -> bool:
         """Delete index"""
+        # Invalidate up front so a failed delete is never trusted as still existing
+        self._exists_cache.pop(index_name, None)
         try:
             client = self._get_client()
             await client.indices.delete(index=index_name)
@@ -101,17 +208,20 @@ class OpenSearchClient:
         query: Dict[str, Any],
         size: int = 100,
         sort: Optional[List[Dict]] = None,
-        source: Optional[List[str]] = None
+        source: Optional[Union[List[str], bool]] = None
     ) -> Dict[str, Any]:
-        """Search documents"""
-        client = self._get_client()
+        """Search documents (source=False fetches hit metadata only)"""
+        if size > OpenSearchClient.LARGE_SEARCH_SIZE:
+            client = self._get_bulk_client()
+        else:
+            client = self._get_client()
         
         body = {"query": query, "size": size}
         
         if sort:
             body["sort"] = sort
         
-        if source:
+        if source is not None:
             body["_source"] = source
         
         return await client.search(index=index, body=body)
@@ -141,6 +251,31 @@ class OpenSearchClient:
             response = await client.index(index=index, body=document)
             return response["_id"]
     
+    async def bulk_index_documents(
+        self,
+        index: str,
+        documents: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None,
+        chunk_size: int = 500
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Index many documents via the _bulk API, returning (success_count, errors)"""
+        client = self._get_bulk_client()
+        
+        def actions():
+            for i, document in enumerate(documents):
+                action = {"_index": index, "_source": document}
+                if ids:
+                    action["_id"] = ids[i]
+                yield action
+        
+        return await async_bulk(
+            client,
+            actions(),
+            chunk_size=chunk_size,
+            raise_on_error=False,
+            refresh=False
+        )
+    
     async def delete_document(self, index: str, doc_id: str) -> bool:
         """Delete document by ID"""
         try:
@@ -150,6 +285,17 @@ class OpenSearchClient:
         except Exception:
             return False
     
+    async def delete_documents(self, index: str, doc_ids: List[str]) -> int:
+        """Delete documents by ID with a single delete_by_query, returning the deleted count"""
+        client = self._get_client()
+        
+        response = await client.delete_by_query(
+            index=index,
+            body={"query": {"terms": {"_id": doc_ids}}},
+            conflicts="proceed"
+        )
+        return response["deleted"]
+    
     async def count_documents(self, index: str, query: Optional[Dict] = None) -> int:
         """Count documents matching query"""
         client = self._get_client()
@@ -171,6 +317,19 @@ class OpenSearchClient:
             return False
 
 
+async def shutdown_all() -> None:
+    """Close every pooled AsyncOpenSearch client (call from session teardown)"""
+    clients = list(OpenSearchClient._POOL.values())
+    OpenSearchClient._POOL.clear()
+    OpenSearchClient._POOL_REFS.clear()
+    
+    for client in clients:
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+
 class OpenSearchQueries:
     """Common OpenSearch queries for testing"""
     
@@ -184,6 +343,14 @@ class OpenSearchQueries:
         """Exact term query"""
         return {"term": {field: value}}
     
+    @staticmethod
+    def specialize_term(field: str) -> Callable[[Any], Dict[str, Any]]:
+        """Bind a field once and return a builder for term queries on it"""
+        def build(value: Any) -> Dict[str, Any]:
+            return {"term": {field: value}}
+        
+        return build
+    
     @staticmethod
     def terms_query(field: str, values: List[str]) -> Dict[str, Any]:
         """Multiple terms query"""
@@ -204,6 +371,26 @@ class OpenSearchQueries:
         
         return {"range": {field: range_params}}
     
+    @staticmethod
+    def specialize_range(field: str, mode: str = "gte_lte") -> Callable[..., Dict[str, Any]]:
+        """
+        Bind a field and its bound operators once and return a range query builder
+        
+        `mode` names the operators in argument order, e.g. "gte_lte" returns
+        build(gte, lte) and "gt" returns build(gt).
+        """
+        operators = tuple(mode.split("_"))
+        unknown = set(operators) - {"gte", "lte", "gt", "lt"}
+        if unknown:
+            raise ValueError(f"Unknown range operators in mode '{mode}': {sorted(unknown)}")
+        
+        def build(*values: Any) -> Dict[str, Any]:
+            if len(values) != len(operators):
+                raise TypeError(f"Range on '{field}' ({mode}) expects {len(operators)} values, got {len(values)}")
+            return {"range": {field: dict(zip(operators, values))}}
+        
+        return build
+    
     @staticmethod
     def bool_query(
         must: Optional[List[Dict]] = None,
@@ -225,6 +412,23 @@ class OpenSearchQueries:
         
         return {"bool": bool_params}
     
+    @staticmethod
+    def run_filter(run_id: str, **filters: Any) -> Dict[str, Any]:
+        """
+        Non-scoring filter on run_id plus exact-match field filters
+        
+        Filter context skips relevance scoring and lets OpenSearch cache the
+        term clauses, e.g. run_filter(run_id, agent="web", tool="zap").
+        """
+        return {
+            "bool": {
+                "filter": [
+                    {"term": {"run_id": run_id}},
+                    *({"term": {field: value}} for field, value in filters.items())
+                ]
+            }
+        }
+    
     @staticmethod
     def exists_query(field: str) -> Dict[str, Any]:
         """Field exists query"""
@@ -252,29 +456,63 @@ class TestDataHelper:
     async def setup_test_indices(self, indices_config: Dict[str, Dict]) -> bool:
         """Setup test indices with mappings"""
         try:
+            just_created: List[str] = []
             for index_name, config in indices_config.items():
                 mapping = config.get("mapping")
-                if not await self.client.index_exists(index_name):
+                if not await self.client.index_exists_cached(index_name):
                     await self.client.create_index(index_name, mapping)
                     self.created_indices.add(index_name)
+                    just_created.append(index_name)
                     print(f"Created test index: {index_name}")
-                
-                # Refresh index to ensure it's ready
-                await self.client.refresh_index(index_name)
+            
+            # Refresh only new indices, in a single request, to ensure they're ready
+            if just_created:
+                await self.client.refresh_index(",".join(just_created))
             
             return True
         except Exception as e:
             print(f"Failed to setup test indices: {e}")
             return False
     
+    async def index_test_documents(self, index: str, documents: List[Dict[str, Any]]) -> List[str]:
+        """Index test documents and track them for cleanup"""
+        if not documents:
+            return []
+        
+        if len(documents) == 1:
+            doc_id = await self.client.index_document(index, documents[0])
+            self.created_documents.append((index, doc_id))
+            return [doc_id]
+        
+        # Assign IDs client-side so bulk-indexed documents can be tracked
+        doc_ids = [uuid.uuid4().hex for _ in documents]
+        _, errors = await self.client.bulk_index_documents(index, documents, ids=doc_ids)
+        
+        failed_ids = {item.get("_id") for error in errors for item in error.values()}
+        if failed_ids:
+            print(f"Failed to index {len(failed_ids)} documents into {index}")
+        
+        indexed_ids = [doc_id for doc_id in doc_ids if doc_id not in failed_ids]
+        self.created_documents.extend((index, doc_id) for doc_id in indexed_ids)
+        return indexed_ids
+    
     async def cleanup_test_data(self) -> None:
         """Clean up created test data"""
-        # Delete created documents
+        # Delete created documents with one delete_by_query per index
+        ids_by_index: Dict[str, List[str]] = defaultdict(list)
         for index, doc_id in self.created_documents:
+            ids_by_index[index].append(doc_id)
+        
+        for index, doc_ids in ids_by_index.items():
             try:
-                await self.client.delete_document(index, doc_id)
+                await self.client.delete_documents(index, doc_ids)
             except Exception:
-                pass
+                # Fall back to deleting documents one at a time
+                for doc_id in doc_ids:
+                    try:
+                        await self.client.delete_document(index, doc_id)
+                    except Exception:
+                        pass
         
         # Optionally delete created indices (commented out for safety)
         # for index_name in self.created_indices:
@@ -294,17 +532,30 @@ class TestDataHelper:
         interval: int = 1
     ) -> Optional[Dict[str, Any]]:
         """Wait for a document to appear in OpenSearch"""
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # Documents usually land quickly, so start polling fast and back off to `interval`
+        delay = 0.05
         
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
-            try:
-                response = await self.client.search(index, query, size=1)
-                if response["hits"]["total"]["value"] > 0:
-                    return response["hits"]["hits"][0]["_source"]
-            except Exception:
-                pass
-            
-            await asyncio.sleep(interval)
+        try:
+            # Bound in-flight requests by the same deadline as the poll loop
+            async with asyncio.timeout_at(deadline):
+                while loop.time() < deadline:
+                    try:
+                        # Poll for hit metadata only, then fetch the full document once
+                        response = await self.client.search(index, query, size=1, source=False)
+                        if response["hits"]["total"]["value"] > 0:
+                            hit = response["hits"]["hits"][0]
+                            document = await self.client.get_document(hit["_index"], hit["_id"])
+                            if document is not None:
+                                return document
+                    except Exception:
+                        pass
+                    
+                    await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+                    delay = min(delay * 1.5, interval)
+        except TimeoutError:
+            pass
         
         return None
     
@@ -317,17 +568,22 @@ class TestDataHelper:
         interval: int = 1
     ) -> bool:
         """Wait for specific document count"""
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
-            try:
-                count = await self.client.count_documents(index, query)
-                if count >= expected_count:
-                    return True
-            except Exception:
-                pass
-            
-            await asyncio.sleep(interval)
+        try:
+            async with asyncio.timeout_at(deadline):
+                while loop.time() < deadline:
+                    try:
+                        count = await self.client.count_documents(index, query)
+                        if count >= expected_count:
+                            return True
+                    except Exception:
+                        pass
+                    
+                    await asyncio.sleep(min(interval, max(deadline - loop.time(), 0)))
+        except TimeoutError:
+            pass
         
         return False
 
@@ -8,9 +8,93 @@ is working correctly by starting a pentest run and then polling for completion.
 
 import asyncio
 import httpx
+import re
+import sys
 import time
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from src.utils import shared_client_lifespan
+
+# Per-request timeout for the verification calls
+REQUEST_TIMEOUT = 5.0
+
+# Status polls are staggered over the same window as the old sequential loop,
+# but each request no longer waits for the previous one to finish
+POLL_ATTEMPTS = 5
+POLL_STAGGER = 1.0
+TERMINAL_STATUSES = ("completed", "error")
+
+# Set by --quiet to suppress progress output; the verdict is always printed
+QUIET = False
+
+TENANT_ID = b"test-logger-fix"
+RUN_ID_RE = re.compile(rb"run_id=([a-f0-9\-]+)")
+
+
+def log(*args) -> None:
+    """Print progress output unless running with --quiet"""
+    if not QUIET:
+        print(*args)
+
+
+async def read_container_logs(container: str = "docker-api-1", tail: int = 50) -> List[bytes]:
+    """Read the last `tail` log lines (stdout and stderr) of a container without blocking the loop"""
+    proc = await asyncio.create_subprocess_exec(
+        "docker", "logs", container, "--tail", str(tail),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT
+    )
+    out, _ = await proc.communicate()
+    return out.splitlines()
+
+
+def find_run_id(lines: List[bytes]) -> Optional[str]:
+    """Extract our run's ID from log lines like: "... tenant_id=test-logger-fix run_id=abc-123-def" """
+    for line in lines:
+        if TENANT_ID in line:
+            match = RUN_ID_RE.search(line)
+            if match:
+                return match.group(1).decode()
+    return None
+
+
+async def poll_run_status(
+    client: httpx.AsyncClient,
+    status_url: str,
+    attempts: int = POLL_ATTEMPTS,
+    stagger: float = POLL_STAGGER
+) -> Optional[str]:
+    """Fire staggered status polls and return the first terminal status, or None"""
+    result: Optional[str] = None
+    tasks: List[asyncio.Task] = []
+    
+    async def poll(attempt: int) -> None:
+        nonlocal result
+        await asyncio.sleep(attempt * stagger)
+        try:
+            status_response = await client.get(status_url, timeout=REQUEST_TIMEOUT)
+            status_data = status_response.json()
+        except Exception as e:
+            log(f"⚠️ Error checking status: {e}")
+            return
+        
+        log(f"📊 Run Status (attempt {attempt + 1}): {json.dumps(status_data, indent=2)}")
+        status = status_data.get("status", "unknown")
+        if status not in TERMINAL_STATUSES:
+            log(f"⏳ Run still in progress: {status}")
+            return
+        
+        # First terminal answer wins; cancel the polls still sleeping or in flight
+        result = status
+        for task in tasks:
+            if task is not asyncio.current_task():
+                task.cancel()
+    
+    async with asyncio.TaskGroup() as tg:
+        tasks.extend(tg.create_task(poll(attempt)) for attempt in range(attempts))
+    
+    return result
 
 
 async def verify_logger_fix():
@@ -19,14 +103,14 @@ async def verify_logger_fix():
     # Test configuration
     api_base = "http://localhost:8080/api/v1"
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    async with shared_client_lifespan() as client:
         # First, verify API is healthy
-        print("🔍 Checking API health...")
-        health_response = await client.get(f"{api_base}/health")
-        print(f"✅ API Health: {health_response.json()}")
+        log("🔍 Checking API health...")
+        health_response = await client.get(f"{api_base}/health", timeout=REQUEST_TIMEOUT)
+        log(f"✅ API Health: {health_response.json()}")
         
         # Start a pentest run (this should not hang on response if our fix works)
-        print("\n🚀 Starting pentest run...")
+        log("\n🚀 Starting pentest run...")
         run_input = {
             "tenant_id": "test-logger-fix",
             "inputs": {
@@ -41,80 +125,59 @@ async def verify_logger_fix():
         # even if response times out
         try:
             start_time = time.time()
-            response = await client.post(f"{api_base}/agents/pentest/run", json=run_input)
+            response = await client.post(f"{api_base}/agents/pentest/run", json=run_input, timeout=REQUEST_TIMEOUT)
             end_time = time.time()
             run_id = response.json()["run_id"]
-            print(f"✅ Run started successfully: {run_id} (took {end_time-start_time:.2f}s)")
+            log(f"✅ Run started successfully: {run_id} (took {end_time-start_time:.2f}s)")
             
         except httpx.ReadTimeout:
-            print("⚠️ POST request timed out, but backend may still be processing...")
+            log("⚠️ POST request timed out, but backend may still be processing...")
             run_id = None
             
         # If we didn't get a run_id from the response, check recent runs
         if run_id is None:
-            print("\n🔍 Checking for recent runs...")
-            # Give backend a moment to process
-            await asyncio.sleep(3)
-            
-            # Look at recent logs to find our run
-            import subprocess
-            result = subprocess.run([
-                "docker", "logs", "docker-api-1", "--tail", "50"
-            ], capture_output=True, text=True)
+            log("\n🔍 Checking for recent runs...")
+            # Look at recent logs for our run, re-reading briefly while the backend catches up
+            for _ in range(6):
+                lines = await read_container_logs()
+                run_id = find_run_id(lines)
+                if run_id is not None:
+                    break
+                await asyncio.sleep(0.5)
             
-            lines = result.stdout.split('\n')
-            print("📋 Recent logs:")
+            log("📋 Recent logs:")
             for line in lines[-10:]:
                 if line.strip():
-                    print(f"  {line}")
+                    log(f"  {line.decode(errors='replace')}")
             
-            # Look for our tenant_id in the logs
-            for line in lines:
-                if "test-logger-fix" in line and "run_id=" in line:
-                    # Extract run_id from log line like: "run_id=abc-123-def"
-                    import re
-                    match = re.search(r'run_id=([a-f0-9\-]+)', line)
-                    if match:
-                        run_id = match.group(1)
-                        print(f"📋 Found run_id from logs: {run_id}")
-                        break
+            if run_id is not None:
+                log(f"📋 Found run_id from logs: {run_id}")
         
         if run_id is None:
-            print("❌ Could not determine run_id")
+            log("❌ Could not determine run_id")
             return False
             
         # Check run status to verify our fix worked
-        print(f"\n🔍 Checking run status for: {run_id}")
-        for attempt in range(5):
-            try:
-                status_response = await client.get(f"{api_base}/runs/{run_id}")
-                status_data = status_response.json()
-                print(f"📊 Run Status (attempt {attempt + 1}): {json.dumps(status_data, indent=2)}")
-                
-                if status_data.get("status") == "completed":
-                    print("\n🎉 SUCCESS! Run completed successfully!")
-                    print("✅ OpenSearchLogger.log_run() fix is working!")
-                    return True
-                elif status_data.get("status") == "error":
-                    print("\n❌ FAILURE! Run failed with error status")
-                    print("❌ OpenSearchLogger fix may not be working")
-                    return False
-                else:
-                    print(f"⏳ Run still in progress: {status_data.get('status', 'unknown')}")
-                    await asyncio.sleep(1)
-                    
-            except Exception as e:
-                print(f"⚠️ Error checking status: {e}")
-                await asyncio.sleep(1)
+        log(f"\n🔍 Checking run status for: {run_id}")
+        status = await poll_run_status(client, f"{api_base}/runs/{run_id}")
+        
+        if status == "completed":
+            log("\n🎉 SUCCESS! Run completed successfully!")
+            log("✅ OpenSearchLogger.log_run() fix is working!")
+            return True
+        elif status == "error":
+            log("\n❌ FAILURE! Run failed with error status")
+            log("❌ OpenSearchLogger fix may not be working")
+            return False
         
-        print("\n⏰ Run did not complete within timeout period")
+        log("\n⏰ Run did not complete within timeout period")
         return False
 
 
 async def main():
     """Main verification function."""
-    print("🧪 OpenSearchLogger Fix Verification Test")
-    print("=" * 50)
+    log("🧪 OpenSearchLogger Fix Verification Test")
+    log("=" * 50)
     
     try:
         success = await verify_logger_fix()
@@ -133,5 +196,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    QUIET = "--quiet" in sys.argv[1:]
     exit_code = asyncio.run(main())
     exit(exit_code)
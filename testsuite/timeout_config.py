@@ -6,40 +6,46 @@ Addresses timeout issues identified in SET report
 import httpx
 from typing import Optional
 
+from src.utils import get_shared_client
+
 class OptimizedAPIClient:
     """API client with optimized timeout settings for pentest operations"""
     
+    # Dead peers and hung TLS handshakes fail within seconds, while reads
+    # stay long enough for slow pentest operations
+    CONNECT_TIMEOUT = 5.0
+    WRITE_TIMEOUT = 30.0
+    POOL_TIMEOUT = 2.0
+    DEFAULT_READ_TIMEOUT = 300.0
+    
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip('/')
         
-        # Optimized timeout configuration for pentest operations
-        timeout_config = httpx.Timeout(
-            connect=30.0,    # Connection establishment timeout
-            read=300.0,      # Read timeout - increased for long pentest operations  
-            write=30.0,      # Write timeout
-            pool=10.0        # Connection pool timeout
-        )
-        
-        # Connection limits to prevent resource exhaustion
-        limits_config = httpx.Limits(
-            max_keepalive_connections=10,
-            max_connections=20
-        )
-        
-        self.client = httpx.AsyncClient(
-            timeout=timeout_config,
-            limits=limits_config,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
+        # Optimized timeout configuration for pentest operations, applied per
+        # request since the connection pool is shared with APIClient and is
+        # looked up at call time
+        self.timeout = self._timeout(self.DEFAULT_READ_TIMEOUT)
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+    
+    @classmethod
+    def _timeout(cls, read_timeout: float) -> httpx.Timeout:
+        """Stage timeouts with the given read timeout"""
+        return httpx.Timeout(
+            connect=cls.CONNECT_TIMEOUT,  # Connection establishment (incl. TLS) timeout
+            read=read_timeout,            # Read timeout - long for pentest operations
+            write=cls.WRITE_TIMEOUT,      # Write timeout
+            pool=cls.POOL_TIMEOUT         # Connection pool timeout
         )
     
-    async def post(self, endpoint: str, data: dict) -> dict:
-        """POST request with error handling"""
+    async def post(self, endpoint: str, data: dict, read_timeout: Optional[float] = None) -> dict:
+        """POST request with error handling; read_timeout overrides the default read timeout"""
         url = f"{self.base_url}{endpoint}"
+        timeout = self._timeout(read_timeout) if read_timeout is not None else self.timeout
         try:
-            response = await self.client.post(url, json=data)
+            response = await get_shared_client().post(url, json=data, headers=self.headers, timeout=timeout)
             response.raise_for_status()
             return response.json()
         except httpx.TimeoutException:
@@ -47,11 +53,12 @@ class OptimizedAPIClient:
         except httpx.HTTPStatusError as e:
             raise Exception(f"HTTP {e.response.status_code}: {e.response.text}")
     
-    async def get(self, endpoint: str) -> dict:
-        """GET request with error handling"""
+    async def get(self, endpoint: str, read_timeout: Optional[float] = None) -> dict:
+        """GET request with error handling; pass a short read_timeout for status polls"""
         url = f"{self.base_url}{endpoint}"
+        timeout = self._timeout(read_timeout) if read_timeout is not None else self.timeout
         try:
-            response = await self.client.get(url)
+            response = await get_shared_client().get(url, headers=self.headers, timeout=timeout)
             response.raise_for_status()
             return response.json()
         except httpx.TimeoutException:
@@ -60,9 +67,9 @@ class OptimizedAPIClient:
             raise Exception(f"HTTP {e.response.status_code}: {e.response.text}")
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the client (no-op; the shared pool is closed by close_shared_client)"""
 
 # Usage in tests:
 # from timeout_config import OptimizedAPIClient
 # api_client = OptimizedAPIClient(test_config["api_base"])
+# status = await api_client.get(f"/runs/{run_id}", read_timeout=5.0)